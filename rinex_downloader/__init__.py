@@ -0,0 +1,21 @@
+"""Shared engine behind the rinex_downloader*.py front-end scripts.
+
+Importing the package is cheap: the download engine (and with it requests)
+is only loaded when RinexDownloader is first accessed, and the GUI,
+BeautifulSoup and tqdm only when they are used.
+"""
+from .profiles import DEFAULT_PROFILE, PROFILES, get_profile
+
+__all__ = ["RinexDownloader", "PROFILES", "DEFAULT_PROFILE", "get_profile", "main"]
+
+
+def __getattr__(name):
+    if name == "RinexDownloader":
+        from .core import RinexDownloader
+
+        return RinexDownloader
+    if name == "main":
+        from .cli import main
+
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,97 @@
+"""Command line entry point shared by every front-end script."""
+import argparse
+import logging
+import os
+from datetime import datetime
+
+from .profiles import DEFAULT_PROFILE, PROFILES, get_profile
+
+
+def setup_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('rinex_downloader.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def parse_args(profile, argv=None):
+    """Parse the command line; --type choices and default follow the selected --profile."""
+    parser = argparse.ArgumentParser(description="RINEX File Downloader")
+    parser.add_argument("--profile", choices=list(PROFILES), default=profile,
+                        help="behaviour of one of the original scripts (layout, threads, retries, GUI)")
+    file_types = get_profile(parser.parse_known_args(argv)[0].profile)['file_types']
+    parser.add_argument("--watch", action="store_true",
+                        help="poll today's and yesterday's directories instead of opening the GUI")
+    parser.add_argument("--type", choices=file_types, default=file_types[0], help="file type to download")
+    parser.add_argument("--stations", default="all", help="comma-separated station codes or 'all'")
+    parser.add_argument("--dir", default=".", help="download directory")
+    parser.add_argument("--interval", type=float, default=15, help="seconds between polls")
+    parser.add_argument("--jitter", type=float, default=3, help="random +/- seconds added to each interval")
+    parser.add_argument("--start", help="start date (YYYY-MM-DD) for a batch download without the GUI")
+    parser.add_argument("--end", help="end date (YYYY-MM-DD), defaults to the start date")
+    parser.add_argument("--workers", type=int, default=1, help="number of download processes")
+    parser.add_argument("--shard-by", choices=["station", "day"], default="station",
+                        help="how files are partitioned between processes")
+    parser.add_argument("--queue", help="SQLite work queue, shared between nodes (default: <dir>/queue.sqlite)")
+    parser.add_argument("--store", help="shared content-addressed store served by hardlinks instead of the network")
+    parser.add_argument("--store-cap", type=float, help="store size limit in GB, least recently used files are evicted")
+    parser.add_argument("--store-revalidate", action="store_true",
+                        help="check size and ETag with a HEAD request before serving a file from the store")
+    parser.add_argument("--merge-nav", action="store_true",
+                        help="write one merged, deduplicated brdc nav file per day after downloading")
+    parser.add_argument("--index-obs", action="store_true",
+                        help="index obs headers and epoch offsets into obs_index.sqlite next to the files "
+                             "(<year>/<doy>/ for mirror profiles, the download directory for flat ones); "
+                             "expanded copies (about 10x a Hatanaka download) are cached in expanded/ beside it")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only print the planned request count and size estimate")
+    parser.add_argument("--probe", action="store_true",
+                        help="with --dry-run, check predicted files with HEAD requests for exact sizes")
+    parser.add_argument("--node", help="name of this node in the merged report (default: hostname)")
+    return parser.parse_args(argv)
+
+
+def main(profile=DEFAULT_PROFILE, argv=None):
+    """Run a batch download, watch mode or the profile's GUI depending on the arguments."""
+    args = parse_args(profile, argv)
+    setup_logging()
+
+    from .core import RinexDownloader
+
+    store = None
+    if args.store:
+        from .store import LocalStore
+
+        store = LocalStore(args.store, int(args.store_cap * 1e9) if args.store_cap else None,
+                           revalidate=args.store_revalidate)
+    downloader = RinexDownloader(args.profile, store)
+    downloader.merge_nav = args.merge_nav
+    downloader.index_obs = args.index_obs
+
+    if args.watch:
+        downloader.download_dir = args.dir
+        try:
+            downloader.watch(args.type, args.stations.split(','), args.interval, args.jitter)
+        except KeyboardInterrupt:
+            logging.info("Watch mode stopped.")
+    elif args.start:
+        downloader.download_dir = args.dir
+        start_date = datetime.strptime(args.start, "%Y-%m-%d")
+        end_date = datetime.strptime(args.end or args.start, "%Y-%m-%d")
+        prefixes = args.stations.split(',')
+        if args.dry_run:
+            downloader.dry_run(args.type, start_date, end_date, prefixes, probe=args.probe)
+            return
+        files = downloader.plan_files(args.type, start_date, end_date, prefixes)
+        queue_path = args.queue or os.path.join(args.dir, "queue.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(queue_path)), exist_ok=True)
+        downloader.download_sharded(files, queue_path, args.workers, args.shard_by, args.node)
+        downloader.post_download(files)
+    else:
+        from .gui import GUIS
+
+        GUIS[downloader.profile['gui']](downloader)
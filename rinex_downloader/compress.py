@@ -0,0 +1,136 @@
+import gzip
+import logging
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+
+def unlzw(data):
+    """Decompress Unix compress (.Z) data.
+
+    Pure Python fallback for systems without gzip on PATH; follows the
+    reference decoder including the quirk that codes are written in groups of
+    eight, so input is skipped to the next group boundary whenever the code
+    width changes or the table is cleared.
+    """
+    if data[:2] != b'\x1f\x9d':
+        raise ValueError("Not a compress (.Z) stream")
+    flags = data[2]
+    max_bits = flags & 0x1f
+    block_mode = flags & 0x80
+    if not 9 <= max_bits <= 16:
+        raise ValueError(f"Unsupported compress code width: {max_bits}")
+    max_entry = (1 << max_bits) - 1
+
+    total_bits = len(data) * 8
+    pos = mark = 24
+    bits = 9
+    table = [bytes([i]) for i in range(256)] + [b'']
+    end = 256 if block_mode else 255
+    prev = None
+    out = bytearray()
+
+    while True:
+        if end >= (1 << bits) - 1 and bits < max_bits:
+            group = bits * 8
+            pos = mark + -(-(pos - mark) // group) * group
+            mark = pos
+            bits += 1
+        if pos + bits > total_bits:
+            break
+        chunk = int.from_bytes(data[pos >> 3:(pos >> 3) + 3], 'little')
+        code = (chunk >> (pos & 7)) & ((1 << bits) - 1)
+        pos += bits
+
+        if code == 256 and block_mode:
+            group = bits * 8
+            pos = mark + -(-(pos - mark) // group) * group
+            mark = pos
+            bits = 9
+            end = 255
+            del table[257:]
+            continue
+
+        if code <= end and code < len(table):
+            entry = table[code]
+        elif code == end + 1 and prev is not None:
+            # KwKwK case: the code being defined by this very step
+            entry = prev + prev[:1]
+        else:
+            raise ValueError("Corrupt compress (.Z) stream")
+        out += entry
+
+        if prev is not None and end < max_entry:
+            end += 1
+            if end < len(table):
+                table[end] = prev + entry[:1]
+            else:
+                table.append(prev + entry[:1])
+        prev = entry
+
+    return bytes(out)
+
+
+def read_rinex(path):
+    """Return the contents of a RINEX file, undoing .Z or .gz compression."""
+    path = str(path)
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+    if path.endswith('.Z'):
+        # gzip decodes .Z streams far faster than the Python fallback
+        if shutil.which('gzip'):
+            return subprocess.run(['gzip', '-dc', path], check=True, capture_output=True).stdout
+        with open(path, 'rb') as f:
+            return unlzw(f.read())
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def is_hatanaka(path):
+    """True for Hatanaka-compressed observation files (.YYd or .crx)."""
+    name = str(path)
+    for suffix in ('.Z', '.gz'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name.lower().endswith('.crx') or (name[-4:-3] == '.' and name[-1:].lower() == 'd')
+
+
+def expanded_name(path):
+    """Return the file name a compressed RINEX file expands to."""
+    name = Path(path).name
+    for suffix in ('.Z', '.gz'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    if is_hatanaka(name):
+        name = name[:-3] + 'rnx' if name.lower().endswith('.crx') else name[:-1] + 'o'
+    return name
+
+
+def expand_rinex(path, out_dir=None):
+    """Write the plain RINEX version of a compressed file and return its path.
+
+    The expanded file goes into out_dir (created if needed), or next to the
+    original when out_dir is None. Hatanaka files need CRX2RNX on PATH; None
+    is returned when it is missing. Files that are already plain RINEX are
+    returned unchanged.
+    """
+    path = Path(path)
+    if expanded_name(path) == path.name:
+        return path
+    out_dir = Path(out_dir) if out_dir is not None else path.parent
+    out_path = out_dir / expanded_name(path)
+    data = read_rinex(path)
+    if is_hatanaka(path):
+        crx2rnx = shutil.which('CRX2RNX') or shutil.which('crx2rnx')
+        if not crx2rnx:
+            logging.warning(f"CRX2RNX not found on PATH, cannot expand {path.name}")
+            return None
+        data = subprocess.run([crx2rnx, '-'], input=data, check=True, capture_output=True).stdout
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + '.part')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, out_path)
+    return out_path
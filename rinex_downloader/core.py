@@ -0,0 +1,451 @@
+"""Shared download engine: planner, lister, fetcher and writer.
+
+Only requests is imported up front; BeautifulSoup and tqdm are loaded the
+first time a listing is parsed or a progress bar is shown.
+"""
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+from .navmerge import merge_nav_day
+from .obsindex import INDEX_NAME, check_stations, index_obs_file
+from .planner import estimate, normalize_prefixes, plan_request
+from .profiles import get_profile
+from .workqueue import WorkQueue, assign_shards, day_of
+
+STATIONS_CSV = Path(__file__).resolve().parent.parent / "igs_stations.csv"
+
+
+class RinexDownloader:
+    def __init__(self, profile=None, store=None):
+        # Behaviour switches of the front-end this engine runs for, see profiles.py
+        self.profile_name = profile
+        self.profile = get_profile(profile)
+        self.base_urls = {
+            "obs": "http://garner.ucsd.edu/pub/rinex",
+            "nav": "http://garner.ucsd.edu/pub/nav"
+        }
+        self.download_dir = ""
+        self.session = self._init_session()
+        # Optional store.LocalStore shared with other download directories
+        self.store = store
+        # Write a merged daily broadcast ephemeris after nav downloads
+        self.merge_nav = False
+        # Index header fields and epoch offsets of each downloaded obs file
+        self.index_obs = False
+        # Day-directory listings kept between polls: (url, prefixes) -> etag, last-modified, links
+        self._listings = {}
+
+    def _init_session(self):
+        """Initialize a keep-alive HTTP session, with the profile's retry strategy."""
+        session = requests.Session()
+        if self.profile['retries']:
+            retries = Retry(total=self.profile['retries'], backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+            adapter = HTTPAdapter(max_retries=retries)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        return session
+
+    def list_rinex_files(self, base_url, start_date, end_date, prefixes):
+        logging.info(f"Listing RINEX files between {start_date.date()} and {end_date.date()}")
+        file_links = []
+        current_date = start_date
+
+        while current_date <= end_date:
+            year = current_date.year
+            doy = current_date.timetuple().tm_yday
+            url = f"{base_url}/{year}/{doy:03d}/"
+            try:
+                resp = self.session.get(url, timeout=10)
+                resp.raise_for_status()
+                file_links.extend(self._parse_listing(url, resp.text, prefixes))
+            except requests.RequestException as e:
+                logging.warning(f"Skipping {url}: {e}")
+            current_date += timedelta(days=1)
+
+        logging.info(f"Found {len(file_links)} files to download.")
+        return file_links
+
+    def _parse_listing(self, url, html, prefixes):
+        """Extract the file links of a directory index page that match the prefixes."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        links = []
+        for link in soup.find_all("a", href=True):
+            href = link["href"]
+            # Skip sort links, parent directory and sub-directories
+            if href.startswith(('?', '/')) or href.endswith('/'):
+                continue
+            if prefixes == ['all'] or any(href.lower().startswith(p.strip().lower()) for p in prefixes):
+                links.append(url + href)
+        return links
+
+    def _local_path(self, file_url):
+        """Map a remote file URL onto the profile's local layout (flat or type/year/doy mirror)."""
+        if self.profile['layout'] == 'flat':
+            return Path(self.download_dir, file_url.split('/')[-1])
+        file_parts = file_url.split('/')[-4:]
+        return Path(self.download_dir, *file_parts)
+
+    def download_file(self, file_url):
+        """Download one file and return success status."""
+        file_path = self._local_path(file_url)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.store:
+            size, etag = self._remote_validators(file_url) if self.store.revalidate else (None, None)
+            cached = self.store.lookup(file_url, size, etag)
+            if cached:
+                try:
+                    self.store.link(cached, file_path)
+                    logging.info(f"From store: {file_path.name}")
+                    if self.index_obs:
+                        self._index_file(file_path)
+                    return True
+                except FileNotFoundError:
+                    # Evicted by another process between lookup and link
+                    pass
+
+        tmp_path = None
+        try:
+            with self.session.get(file_url, stream=True, timeout=15) as r:
+                r.raise_for_status()
+                total_size = int(r.headers.get('content-length', 0))
+                # Write to a temporary name so a partial file is never mistaken for a finished one
+                if self.store:
+                    tmp_path = self.store.temp_path(file_path.name)
+                else:
+                    tmp_path = file_path.with_name(file_path.name + '.part')
+                with open(tmp_path, 'wb') as f, self._progress_bar(total_size, file_path.name) as bar:
+                    for chunk in r.iter_content(chunk_size=64 * 1024):
+                        if chunk:
+                            f.write(chunk)
+                            bar.update(len(chunk))
+                if self.store:
+                    self.store.add(file_url, tmp_path, r.headers.get('ETag'), dest=file_path)
+                else:
+                    os.replace(tmp_path, file_path)
+        except requests.HTTPError as e:
+            self._discard(tmp_path)
+            if e.response is not None and e.response.status_code == 404:
+                # Expected for predicted names of stations without data that day
+                logging.info(f"Not on server: {file_url}")
+                return None
+            logging.error(f"Failed: {file_url} -> {e}")
+            return False
+        except Exception as e:
+            self._discard(tmp_path)
+            logging.error(f"Failed: {file_url} -> {e}")
+            return False
+
+        logging.info(f"Downloaded: {file_path.name}")
+        if self.index_obs:
+            self._index_file(file_path)
+        return True
+
+    def _remote_validators(self, file_url):
+        """Return the (size, ETag) the server reports for a file, (None, None) when unknown."""
+        try:
+            resp = self.session.head(file_url, timeout=10, allow_redirects=True)
+            resp.raise_for_status()
+        except requests.RequestException:
+            # Unreachable: keep serving the cached copy
+            return None, None
+        length = resp.headers.get('content-length')
+        return (int(length) if length else None), resp.headers.get('ETag')
+
+    @staticmethod
+    def _discard(tmp_path):
+        """Remove what is left of a failed transfer."""
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    def _progress_bar(self, total_size, name):
+        """Return a tqdm bar, or a no-op stand-in when the profile has progress bars off."""
+        if not self.profile['progress']:
+            return _NoProgress()
+        from tqdm import tqdm
+
+        return tqdm(total=total_size, unit='B', unit_scale=True, desc=name, leave=False)
+
+    def _index_file(self, file_path):
+        """Add a downloaded obs file to its day index; indexing problems never fail the download."""
+        try:
+            index_obs_file(file_path)
+        except Exception as e:
+            logging.error(f"Indexing failed for {file_path.name}: {e}")
+
+    def plan_files(self, file_type, start_date, end_date, prefixes):
+        """Resolve a request into file URLs, listing only the days whose names cannot be predicted."""
+        base_url = self.base_urls[file_type]
+        prefixes = normalize_prefixes(prefixes)
+        steps = plan_request(base_url, file_type, start_date, end_date, prefixes)
+        files = []
+        list_days = []
+        for step in steps + [None]:
+            if step is not None and step['strategy'] == 'list':
+                list_days.append(step['day'])
+                continue
+            # Consecutive listing days go through one list_rinex_files call
+            if list_days:
+                files.extend(self.list_rinex_files(base_url, list_days[0], list_days[-1], prefixes))
+                list_days = []
+            if step is not None:
+                files.extend(step['urls'])
+
+        direct = sum(1 for step in steps if step['strategy'] == 'direct')
+        logging.info(f"Planned {len(files)} files: {direct} days by predicted names, "
+                     f"{len(steps) - direct} days by listing")
+        return files
+
+    def dry_run(self, file_type, start_date, end_date, prefixes, probe=False):
+        """Estimate the requests and bytes of a download without fetching any file.
+
+        With probe, predicted files are checked with HEAD requests so missing
+        files and real sizes replace the averages.
+        """
+        steps = plan_request(self.base_urls[file_type], file_type, start_date, end_date, prefixes)
+        sizes = {}
+        if probe:
+            sizes = self._probe_sizes([url for step in steps if step['strategy'] == 'direct' for url in step['urls']])
+        result = estimate(steps, file_type, prefixes, sizes)
+        logging.info(
+            f"Dry run: {result['days']} days ({result['direct_days']} direct, {result['list_days']} listed), "
+            f"{result['listing_requests']} listing requests, "
+            f"{result['file_requests'] if result['complete'] else 'unknown number of'} file requests, "
+            f"~{result['bytes'] / 1e6:.1f} MB" + ("" if result['complete'] else " plus the listed files")
+        )
+        return result
+
+    def _probe_sizes(self, urls):
+        """Map remote files to their Content-Length, or None when they do not exist.
+
+        Files whose HEAD request fails or reports no length are left out, so
+        estimate() counts them at the average size.
+        """
+        sizes = {}
+        with ThreadPoolExecutor(max_workers=8) as exe:
+            futures = {exe.submit(self.session.head, url, timeout=10, allow_redirects=True): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    resp = future.result()
+                    if resp.status_code == 404:
+                        sizes[url] = None
+                        continue
+                    resp.raise_for_status()
+                except requests.RequestException as e:
+                    logging.warning(f"Probe failed for {url}: {e}")
+                    continue
+                if resp.headers.get('content-length'):
+                    sizes[url] = int(resp.headers['content-length'])
+        return sizes
+
+    def poll_day_listing(self, url, prefixes):
+        """Fetch a day directory listing, reusing the cached links when the server reports no change."""
+        key = (url, tuple(prefixes))
+        cached = self._listings.get(key)
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        resp = self.session.get(url, headers=headers, timeout=10)
+        if resp.status_code == 304:
+            return cached['links']
+        if resp.status_code == 404:
+            # The archive has not created this day directory yet
+            return []
+        resp.raise_for_status()
+
+        links = self._parse_listing(url, resp.text, prefixes)
+        self._listings[key] = {
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+            'links': links,
+        }
+        return links
+
+    def download_files(self, files, on_result=None):
+        """Download files with the profile's thread count and return (success, failed, missing) counts.
+
+        missing counts predicted files the server does not have, which are not
+        errors. on_result(done, total, ok) is called after every file, e.g. to
+        drive a progress bar.
+        """
+        success, fail, missing = 0, 0, 0
+        with ThreadPoolExecutor(max_workers=self.profile['threads']) as exe:
+            futures = {exe.submit(self.download_file, url): url for url in files}
+            for i, future in enumerate(as_completed(futures)):
+                ok = future.result()
+                if ok:
+                    success += 1
+                elif ok is None:
+                    missing += 1
+                else:
+                    fail += 1
+                if on_result:
+                    on_result(i + 1, len(files), ok)
+        self.post_download(files)
+        return success, fail, missing
+
+    def watch(self, file_type, prefixes, interval=15, jitter=3, max_workers=None):
+        """Poll the current and previous UTC day directories and fetch new files until interrupted.
+
+        The HTTP session and the listing cache stay warm between polls, so an
+        unchanged directory costs a single conditional request.
+        """
+        base_url = self.base_urls[file_type]
+        seen = set()
+        logging.info(f"Watching {base_url} for {','.join(prefixes)} every {interval}s (+/- {jitter}s)")
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.profile['threads']) as exe:
+            while True:
+                now = datetime.now(timezone.utc)
+                day_urls = [f"{base_url}/{day.year}/{day.timetuple().tm_yday:03d}/"
+                            for day in (now - timedelta(days=1), now)]
+
+                current = []
+                for url in day_urls:
+                    try:
+                        current.extend(self.poll_day_listing(url, prefixes))
+                    except requests.RequestException as e:
+                        logging.warning(f"Poll failed for {url}: {e}")
+
+                # Forget days that have rolled out of the window
+                self._listings = {k: v for k, v in self._listings.items() if k[0] in day_urls}
+                seen &= set(current)
+
+                new_files = []
+                for file_url in current:
+                    if file_url in seen:
+                        continue
+                    if self._local_path(file_url).exists():
+                        seen.add(file_url)
+                        continue
+                    new_files.append(file_url)
+
+                if new_files:
+                    logging.info(f"Found {len(new_files)} new files.")
+                    futures = {exe.submit(self.download_file, url): url for url in new_files}
+                    for future in as_completed(futures):
+                        # Failed downloads stay unseen and are retried on the next poll
+                        if future.result():
+                            seen.add(futures[future])
+                    self.post_download([url for url in new_files if url in seen])
+
+                time.sleep(max(0, interval + random.uniform(-jitter, jitter)))
+
+    def post_download(self, file_links):
+        """Run the optional post-download stages on the day directories touched by file_links."""
+        day_dirs = sorted({self._local_path(url).parent for url in file_links})
+        if self.merge_nav:
+            # The date comes from the archive URL, since flat layouts have no year/doy directories
+            for day_dir, (year, doy) in sorted({(self._local_path(url).parent, day_of(url)) for url in file_links}):
+                try:
+                    merge_nav_day(day_dir, year, doy)
+                except OSError as e:
+                    logging.error(f"Nav merge failed for {day_dir} {year}/{doy:03d}: {e}")
+        if self.index_obs:
+            for day_dir in day_dirs:
+                if not (day_dir / INDEX_NAME).exists():
+                    continue
+                for name, field, value, expected in check_stations(day_dir / INDEX_NAME, STATIONS_CSV):
+                    logging.warning(f"{name}: header {field} '{value}' differs from IGS '{expected}'")
+
+    def download_sharded(self, files, queue_path, workers=4, shard_by="station", node=None):
+        """Download files with several processes pulling from a shared SQLite work queue.
+
+        Nodes that share the download directory can point at the same queue
+        file; files already queued or finished by another node are skipped.
+        Returns the per-shard report for these files, merged from all workers;
+        rows of earlier runs on the same queue are left out.
+        """
+        run_started = time.time()
+        queue = WorkQueue(queue_path)
+        queue.requeue_stale()
+        added = queue.add(assign_shards(files, workers, shard_by), lambda url: self._local_path(url).exists())
+        logging.info(f"Queued {added} files ({len(files) - added} already done or in progress) in {queue_path}")
+
+        node = node or socket.gethostname()
+        procs = [
+            multiprocessing.Process(
+                target=_shard_worker,
+                args=(queue_path, self.download_dir, shard, f"{node}:{shard}",
+                      self.profile_name, self.store, self.index_obs),
+            )
+            for shard in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+
+        report = queue.report(files, since=run_started)
+        for row in report:
+            logging.info(
+                f"Shard {row['shard']}: {row['done']}/{row['files']} done, {row['failed']} failed, "
+                f"{row['missing']} not on server, {row['remaining']} remaining, {row['bytes'] / 1e6:.1f} MB by {row['workers']} workers"
+            )
+        done = sum(row['done'] for row in report)
+        failed = sum(row['failed'] for row in report)
+        missing = sum(row['missing'] for row in report)
+        total_bytes = sum(row['bytes'] for row in report)
+        started = min((row['started'] for row in report if row['started']), default=None)
+        finished = max((row['finished'] for row in report if row['finished']), default=None)
+        elapsed = (finished - started) if started and finished else 0
+        rate = f", {total_bytes / 1e6 / elapsed:.1f} MB/s" if elapsed else ""
+        logging.info(f"Total: {done} done, {failed} failed, {missing} not on server, {total_bytes / 1e6:.1f} MB{rate}")
+        return report
+
+
+def _shard_worker(queue_path, download_dir, shard, worker_id, profile=None, store=None, index_obs=False):
+    """Process entry point: claim files from the queue until it is drained."""
+    downloader = RinexDownloader(profile, store)
+    downloader.download_dir = download_dir
+    downloader.index_obs = index_obs
+    queue = WorkQueue(queue_path)
+
+    def run():
+        while True:
+            file_url = queue.claim(worker_id, shard)
+            if file_url is None:
+                if not queue.has_pending():
+                    break
+                # Only files waiting out their retry delay are left
+                time.sleep(1)
+                continue
+            ok = downloader.download_file(file_url)
+            nbytes = downloader._local_path(file_url).stat().st_size if ok else 0
+            queue.finish(file_url, ok, nbytes)
+
+    # A few threads per process keep the pipe busy while another file is being written
+    threads = downloader.profile['threads']
+    with ThreadPoolExecutor(max_workers=threads) as exe:
+        for future in [exe.submit(run) for _ in range(threads)]:
+            future.result()
+
+
+class _NoProgress:
+    """Stand-in for tqdm when progress bars are disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def update(self, n):
+        pass
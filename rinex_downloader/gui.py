@@ -0,0 +1,147 @@
+"""Tkinter front-ends; imported only when a GUI is actually opened."""
+import logging
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from tkinter import filedialog, messagebox, simpledialog, ttk
+
+
+def run_dialog(downloader):
+    """Ask for dates, stations and (if the profile offers several) file type with simple prompts."""
+    root = tk.Tk()
+    root.withdraw()  # Hide the root window
+
+    start_date_str = simpledialog.askstring("Input", "Enter Start Date (YYYY-MM-DD):")
+    end_date_str = simpledialog.askstring("Input", "Enter End Date (YYYY-MM-DD):")
+    prefix_input = simpledialog.askstring("Input", "Enter prefixes (comma separated):")
+
+    file_types = downloader.profile['file_types']
+    file_type_var = tk.StringVar(value=file_types[0])
+    if len(file_types) > 1:
+        file_type_window = tk.Toplevel()
+        file_type_window.title("Select File Type")
+        file_type_window.geometry("250x100")
+
+        tk.Label(file_type_window, text="Select File Type:").pack()
+        ttk.Combobox(file_type_window, textvariable=file_type_var, values=file_types).pack()
+        tk.Button(file_type_window, text="OK", command=file_type_window.destroy).pack()
+        file_type_window.wait_window()
+
+    try:
+        start_date = datetime.strptime(start_date_str or "", "%Y-%m-%d")
+        end_date = datetime.strptime(end_date_str or "", "%Y-%m-%d")
+    except ValueError:
+        messagebox.showerror("Error", "Invalid date format. Please enter dates as YYYY-MM-DD.")
+        return
+    prefixes = [p.strip() for p in prefix_input.split(',')] if prefix_input else []
+    if not prefixes:
+        messagebox.showerror("Error", "Invalid input provided.")
+        return
+
+    files = downloader.plan_files(file_type_var.get(), start_date, end_date, prefixes)
+    if files:
+        print("Downloading files:")
+        downloader.download_files(files)
+    else:
+        messagebox.showinfo("Info", "No matching files found or unable to access the directories.")
+
+
+def run_form(downloader):
+    """Full form with date pickers, directory chooser and a progress bar."""
+    from tkcalendar import DateEntry
+
+    root = tk.Tk()
+    root.title("RINEX File Downloader")
+    root.geometry("650x450")
+
+    frame = ttk.Frame(root, padding="12")
+    frame.pack(fill=tk.BOTH, expand=True)
+
+    # Inputs
+    ttk.Label(frame, text="Start Date:").grid(row=0, column=0, sticky='w')
+    start_date = tk.StringVar()
+    DateEntry(frame, textvariable=start_date, date_pattern='yyyy-mm-dd').grid(row=0, column=1, pady=5)
+
+    ttk.Label(frame, text="End Date:").grid(row=1, column=0, sticky='w')
+    end_date = tk.StringVar()
+    DateEntry(frame, textvariable=end_date, date_pattern='yyyy-mm-dd').grid(row=1, column=1, pady=5)
+
+    ttk.Label(frame, text="Station Codes (comma-separated or 'all'):").grid(row=2, column=0, sticky='w')
+    prefixes = tk.StringVar()
+    ttk.Entry(frame, textvariable=prefixes).grid(row=2, column=1, sticky='ew', pady=5)
+
+    file_types = downloader.profile['file_types']
+    ttk.Label(frame, text="File Type:").grid(row=3, column=0, sticky='w')
+    file_type = tk.StringVar(value=file_types[0])
+    ttk.Combobox(frame, textvariable=file_type, values=file_types, state="readonly").grid(row=3, column=1, pady=5)
+
+    ttk.Label(frame, text="Download Directory:").grid(row=4, column=0, sticky='w')
+    dir_var = tk.StringVar()
+    ttk.Entry(frame, textvariable=dir_var).grid(row=4, column=1, sticky='ew', pady=5)
+    ttk.Button(frame, text="Browse", command=lambda: dir_var.set(filedialog.askdirectory())).grid(
+        row=4, column=2, padx=5)
+
+    # Progress bar and status
+    progress = ttk.Progressbar(frame, length=400, mode='determinate')
+    progress.grid(row=6, column=0, columnspan=3, pady=10)
+    status_label = ttk.Label(frame, text="Ready.")
+    status_label.grid(row=7, column=0, columnspan=3)
+
+    # Download button
+    ttk.Button(frame, text="Start Download", command=lambda: start_download(
+        downloader, start_date.get(), end_date.get(), prefixes.get(), file_type.get(), dir_var.get(),
+        progress, status_label, root
+    )).grid(row=5, column=0, columnspan=3, pady=15)
+
+    ttk.Label(frame, text="Note: \n 1. Station code is four characters. \n 2. Use 'all' to download all files. "
+                          "\n 3. Stations in India: IISC, HYDE, JDPR, PBR4, BHPL, LCK3, LCK4, IITK, DRDN, SHLG").grid(
+        row=8, column=0, columnspan=3, pady=5)
+
+    frame.columnconfigure(1, weight=1)
+    root.mainloop()
+
+
+def start_download(downloader, start, end, prefix, ftype, out_dir, progress, status_label, root):
+    """Run a form download in the background, updating the progress bar as files finish."""
+    if not out_dir:
+        messagebox.showerror("Error", "Please select a download directory")
+        return
+    downloader.download_dir = out_dir
+
+    def on_result(done, total, ok):
+        progress['value'] = done
+        status_label.config(text=f"Progress: {done}/{total}")
+
+    def task():
+        try:
+            status_label.config(text="Fetching file list...")
+            start_date = datetime.strptime(start, "%Y-%m-%d")
+            end_date = datetime.strptime(end, "%Y-%m-%d")
+            prefixes = prefix.split(',') if prefix else ['all']
+
+            files = downloader.plan_files(ftype, start_date, end_date, prefixes)
+            if not files:
+                messagebox.showinfo("Info", "No matching files found.")
+                status_label.config(text="No files found.")
+                return
+
+            progress['maximum'] = len(files)
+            progress['value'] = 0
+            success, fail, missing = downloader.download_files(files, on_result)
+
+            summary = f"✅ Successful: {success}\n❌ Failed: {fail}"
+            if missing:
+                summary += f"\nNot on server: {missing}"
+            messagebox.showinfo("Download Complete", summary)
+            status_label.config(text="Download finished.")
+        except ValueError:
+            messagebox.showerror("Error", "Invalid date format. Please use YYYY-MM-DD")
+        except Exception as e:
+            logging.error(f"Error in GUI download: {e}")
+            messagebox.showerror("Error", str(e))
+
+    # Run in background
+    root.after(100, lambda: ThreadPoolExecutor(max_workers=1).submit(task))
+
+
+GUIS = {"dialog": run_dialog, "form": run_form}
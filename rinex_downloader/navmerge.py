@@ -0,0 +1,181 @@
+import csv
+import logging
+import re
+from pathlib import Path
+
+from .compress import read_rinex
+
+# Lines per ephemeris record, by RINEX 2 file type and by RINEX 3 satellite system
+RECORD_LINES_V2 = {'N': 8, 'G': 4, 'H': 4}
+RECORD_LINES_V3 = {'G': 8, 'E': 8, 'J': 8, 'C': 8, 'I': 8, 'R': 4, 'S': 4}
+# RINEX 3.05 added a fifth line (status flags) to GLONASS records
+GLONASS_LINES_305 = 5
+# Satellite system letter of RINEX 2 nav file types
+SYSTEM_V2 = {'N': 'G', 'G': 'R', 'H': 'S'}
+
+# Header corrections that differ between stations and are merged from every input
+CORRECTION_LABELS = ('IONOSPHERIC CORR', 'TIME SYSTEM CORR')
+
+# Station nav files: ssssDDDf.YYn (RINEX 2) or *_[GREJCIS M]N.rnx (RINEX 3), optionally compressed
+NAV_NAME = re.compile(r'(\.\d\d[ngh]|_[A-Z]N\.rnx)(\.Z|\.gz)?$', re.IGNORECASE)
+
+
+def _float(field):
+    """Parse a Fortran D/E formatted number."""
+    return float(field.replace('D', 'E').replace('d', 'e'))
+
+
+def record_lines_v3(system, version):
+    """Number of lines of a RINEX 3 ephemeris record for a satellite system and file version."""
+    if system == 'R' and version >= 3.05:
+        return GLONASS_LINES_305
+    return RECORD_LINES_V3.get(system, 8)
+
+
+def parse_nav(data):
+    """Split a RINEX navigation file into its header and ephemeris records.
+
+    Returns (header_lines, version, records) where each record is a tuple
+    (key, lines) and key is (satellite, time of clock, time of ephemeris).
+    """
+    lines = data.decode('latin-1').splitlines()
+    for n, line in enumerate(lines):
+        if line[60:].strip() == 'END OF HEADER':
+            break
+    else:
+        raise ValueError("No END OF HEADER line")
+    header, body = lines[:n + 1], lines[n + 1:]
+    version = _float(header[0][:9])
+    file_type = header[0][20]
+
+    records = []
+    i = 0
+    while i < len(body):
+        line = body[i]
+        if not line.strip():
+            i += 1
+            continue
+        if version >= 3:
+            sat = line[:3].replace(' ', '0')
+            n_lines = record_lines_v3(sat[0], version)
+            toc = line[4:23]
+            orbit_start = 4
+        else:
+            sat = f"{SYSTEM_V2.get(file_type, 'G')}{int(line[:2]):02d}"
+            n_lines = RECORD_LINES_V2.get(file_type, 8)
+            yy, mm, dd, hh, mi = (int(x) for x in line[2:17].split())
+            year = yy + (2000 if yy < 80 else 1900)
+            toc = f"{year:04d} {mm:02d} {dd:02d} {hh:02d} {mi:02d} {_float(line[17:22]):02.0f}"
+            orbit_start = 3
+        record = body[i:i + n_lines]
+        i += n_lines
+        if len(record) < n_lines:
+            logging.warning(f"Truncated record for {sat} at {toc.strip()}")
+            break
+        # Toe is the first field of broadcast orbit 3; GLONASS/SBAS records have none
+        toe = _float(record[3][orbit_start:orbit_start + 19]) if n_lines == 8 else None
+        records.append(((sat, ' '.join(toc.split()), toe), record))
+    return header, version, records
+
+
+def merge_nav_files(paths, out_path):
+    """Merge station nav files into one file with each ephemeris kept once.
+
+    Records are deduplicated by satellite, time of clock and time of
+    ephemeris, sorted by time then satellite, and written after the header
+    of the first file. Ionospheric and time system corrections are collected
+    from every input (first value per correction type wins). RINEX 3 output
+    takes the highest input version and is marked M: MIXED when it holds more
+    than one satellite system; GLONASS records from files before 3.05 then
+    get a blank status-flag line. A CSV index (<out_path>.idx) lists the byte
+    offset and length of every record. Returns the number of records written.
+    """
+    header = None
+    version = 0
+    corrections = {}
+    merged = {}
+    n_files = 0
+    for path in paths:
+        try:
+            file_header, file_version, records = parse_nav(read_rinex(path))
+        except (OSError, ValueError) as e:
+            logging.warning(f"Skipping {path}: {e}")
+            continue
+        n_files += 1
+        if header is None:
+            header = file_header
+        version = max(version, file_version)
+        for line in file_header:
+            if line[60:].strip() in CORRECTION_LABELS:
+                corrections.setdefault((line[60:].strip(), line[:5].strip()), line)
+        for key, record in records:
+            merged.setdefault(key, record)
+
+    if header is None:
+        return 0
+
+    if version >= 3:
+        for key, record in merged.items():
+            if key[0][0] == 'R' and version >= 3.05 and len(record) < GLONASS_LINES_305:
+                merged[key] = record + [' ' * 4 + ' ' * 19 * 4]
+        mixed = len({key[0][0] for key in merged}) > 1
+        system = f"{'M: MIXED':<20}" if mixed else header[0][40:60]
+        header[0] = f"{version:9.2f}{header[0][9:40]}{system}{header[0][60:]}"
+
+    # Replace the first file's corrections with the merged set, where they stood
+    kept = [line for line in header[:-1] if line[60:].strip() not in CORRECTION_LABELS]
+    position = next((i for i, line in enumerate(header) if line[60:].strip() in CORRECTION_LABELS), len(header) - 1)
+    comment = f"{f'MERGED FROM {n_files} FILES':<60}COMMENT"
+    header = kept[:position] + list(corrections.values()) + kept[position:] + [comment, header[-1]]
+
+    out_path = Path(out_path)
+    index = []
+    with open(out_path, 'wb') as f:
+        f.write(('\n'.join(header) + '\n').encode('latin-1'))
+        for key in sorted(merged, key=lambda k: (k[1], k[0], k[2] or 0)):
+            data = ('\n'.join(merged[key]) + '\n').encode('latin-1')
+            index.append((key[0], key[1], key[2], f.tell(), len(data)))
+            f.write(data)
+
+    with open(out_path.with_name(out_path.name + '.idx'), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['sat', 'toc', 'toe', 'offset', 'length'])
+        writer.writerows(index)
+
+    logging.info(f"Merged {n_files} nav files into {out_path.name}: {len(index)} ephemerides")
+    return len(index)
+
+
+def _is_day_file(name, year, doy):
+    """True when a station file name belongs to the given day."""
+    if name.lower().endswith(('.rnx', '.rnx.z', '.rnx.gz')):
+        # RINEX 3 long names carry _YYYYDDDHHMM_
+        return f"_{year:04d}{doy:03d}" in name
+    # RINEX 2 short names: ssssDDDf.YYt
+    return name[4:7] == f"{doy:03d}" and name[9:11] == f"{year % 100:02d}"
+
+
+def merge_nav_day(day_dir, year, doy):
+    """Merge the station nav files of one day found in day_dir into daily products.
+
+    Files are selected by the date in their names, so this works for the
+    year/doy mirror as well as for flat directories holding several days.
+    RINEX 2 GPS, GLONASS and SBAS files become brdcDDD0.YYn/g/h and RINEX 3
+    files become brdmDDD0.YYp. Returns the paths written.
+    """
+    day_dir = Path(day_dir).resolve()
+    groups = {}
+    for path in sorted(day_dir.iterdir()):
+        match = NAV_NAME.search(path.name)
+        if not match or path.name.startswith(('brdc', 'brdm')) or not _is_day_file(path.name, year, doy):
+            continue
+        letter = 'p' if match.group(1).lower().endswith('.rnx') else match.group(1)[-1].lower()
+        groups.setdefault(letter, []).append(path)
+
+    written = []
+    for letter, paths in groups.items():
+        prefix = 'brdm' if letter == 'p' else 'brdc'
+        out_path = day_dir / f"{prefix}{doy:03d}0.{year % 100:02d}{letter}"
+        if merge_nav_files(paths, out_path):
+            written.append(out_path)
+    return written
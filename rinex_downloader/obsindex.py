@@ -0,0 +1,204 @@
+import calendar
+import csv
+import logging
+import mmap
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+from .compress import expand_rinex
+
+INDEX_NAME = "obs_index.sqlite"
+# Cache of expanded (plain RINEX) copies next to the index; safe to delete, read_epoch() rebuilds files on demand
+EXPANDED_DIR = "expanded"
+
+# Observation files: ssssDDDf.YYo/.YYd (RINEX 2) or *_MO.rnx/.crx (RINEX 3), optionally compressed
+OBS_NAME = re.compile(r'(\.\d\d[od]|_[A-Z]O\.(rnx|crx))(\.Z|\.gz)?$', re.IGNORECASE)
+
+# Epoch lines; event flags 0, 1 and 6 carry observations, 2-5 are special records
+EPOCH_V2 = re.compile(
+    rb'^ ([ \d]\d) ([ \d]\d) ([ \d]\d) ([ \d]\d) ([ \d]\d) ([ \d]\d\.\d{7})  ([016])', re.MULTILINE)
+EPOCH_V3 = re.compile(
+    rb'^> (\d{4}) ([ \d]\d) ([ \d]\d) ([ \d]\d) ([ \d]\d) ([ \d]\d\.\d{7})  ([016])', re.MULTILINE)
+
+
+def _epoch_seconds(year, month, day, hour, minute, second):
+    """Convert an epoch to seconds since 1970 on the file's own time scale."""
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 80 else 1900
+    return calendar.timegm((year, int(month), int(day), int(hour), int(minute), 0)) + float(second)
+
+
+def _to_seconds(when):
+    return when if isinstance(when, (int, float)) else calendar.timegm(when.timetuple())
+
+
+def scan_obs(path):
+    """Extract header fields and epoch byte offsets from a plain RINEX obs file.
+
+    The file is memory-mapped and only the epoch lines are matched, so the
+    observation records themselves are never parsed.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = mm.find(b'END OF HEADER')
+        if end < 0:
+            raise ValueError("No END OF HEADER line")
+        end = mm.find(b'\n', end) + 1
+        header = {}
+        for line in mm[:end].decode('latin-1').splitlines():
+            header.setdefault(line[60:].strip(), line[:60])
+
+        version = float(header.get('RINEX VERSION / TYPE', '2')[:9])
+        pattern = EPOCH_V3 if version >= 3 else EPOCH_V2
+        epochs = [(_epoch_seconds(*m.groups()[:6]), m.start()) for m in pattern.finditer(mm, end)]
+
+    interval = header.get('INTERVAL', '').strip()
+    return {
+        'marker': header.get('MARKER NAME', '')[:60].strip(),
+        'receiver': header.get('REC # / TYPE / VERS', ' ' * 40)[20:40].strip(),
+        'antenna': header.get('ANT # / TYPE', ' ' * 40)[20:36].strip(),
+        'radome': header.get('ANT # / TYPE', ' ' * 40)[36:40].strip() or 'NONE',
+        'interval': float(interval) if interval else None,
+        'version': version,
+        'epochs': epochs,
+    }
+
+
+@contextmanager
+def _open_index(index_path):
+    conn = sqlite3.connect(index_path, timeout=60)
+    try:
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    name TEXT PRIMARY KEY,
+                    source TEXT,
+                    station TEXT,
+                    marker TEXT,
+                    receiver TEXT,
+                    antenna TEXT,
+                    radome TEXT,
+                    interval REAL,
+                    version REAL,
+                    first_epoch REAL,
+                    last_epoch REAL,
+                    n_epochs INTEGER
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS epochs (
+                    name TEXT,
+                    epoch REAL,
+                    offset INTEGER,
+                    PRIMARY KEY (name, epoch)
+                ) WITHOUT ROWID""")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(files)")]
+            if 'source' not in columns:
+                # Indexes written before the expanded/ cache kept plain files beside the originals
+                conn.execute("ALTER TABLE files ADD COLUMN source TEXT")
+            yield conn
+    finally:
+        conn.close()
+
+
+def _plain_path(index_path, name, source):
+    """Location of the plain RINEX file behind an index entry, expanding it again if the cache was cleared."""
+    day_dir = Path(index_path).parent
+    if source is None or name == source:
+        return day_dir / name
+    plain = day_dir / EXPANDED_DIR / name
+    if not plain.exists():
+        plain = expand_rinex(day_dir / source, day_dir / EXPANDED_DIR)
+    return plain
+
+
+def index_obs_file(path):
+    """Expand a downloaded obs file and add it to the obs_index.sqlite of its directory.
+
+    That is the year/doy directory in the mirror layout and the download
+    directory, shared by all days, in the flat layout.
+
+    Compressed files are expanded into the expanded/ cache beside the index;
+    plain RINEX is about 3x the size of .Z/.gz and Hatanaka files about 10x.
+    Returns the index path, or None when the file is not an observation file
+    or cannot be expanded.
+    """
+    path = Path(path)
+    if not OBS_NAME.search(path.name):
+        return None
+    plain = expand_rinex(path, path.parent / EXPANDED_DIR)
+    if plain is None:
+        return None
+    info = scan_obs(plain)
+    epochs = info['epochs']
+
+    index_path = path.parent / INDEX_NAME
+    with _open_index(index_path) as conn:
+        conn.execute("DELETE FROM epochs WHERE name = ?", (plain.name,))
+        conn.execute(
+            "INSERT OR REPLACE INTO files (name, source, station, marker, receiver, antenna, radome, interval, "
+            "version, first_epoch, last_epoch, n_epochs) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (plain.name, path.name, plain.name[:4].upper(), info['marker'], info['receiver'], info['antenna'],
+             info['radome'], info['interval'], info['version'],
+             epochs[0][0] if epochs else None, epochs[-1][0] if epochs else None, len(epochs)),
+        )
+        # Duplicate epochs (rare, after receiver resets) keep their first occurrence
+        conn.executemany("INSERT OR IGNORE INTO epochs VALUES (?, ?, ?)",
+                         ((plain.name, epoch, offset) for epoch, offset in epochs))
+    logging.info(f"Indexed {plain.name}: {len(epochs)} epochs")
+    return index_path
+
+
+def files_covering(index_path, start, end):
+    """Return the indexed files whose observations overlap [start, end]."""
+    with _open_index(index_path) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            "SELECT * FROM files WHERE first_epoch <= ? AND last_epoch >= ? ORDER BY name",
+            (_to_seconds(end), _to_seconds(start)),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def read_epoch(index_path, name, when):
+    """Return the raw text of the first epoch at or after when, read straight from its byte offset."""
+    with _open_index(index_path) as conn:
+        source = conn.execute("SELECT source FROM files WHERE name = ?", (name,)).fetchone()
+        rows = conn.execute(
+            "SELECT offset FROM epochs WHERE name = ? AND epoch >= ? ORDER BY epoch LIMIT 2",
+            (name, _to_seconds(when)),
+        ).fetchall()
+    if not rows:
+        return None
+    plain = _plain_path(index_path, name, source[0])
+    if plain is None:
+        return None
+    with open(plain, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        stop = rows[1][0] if len(rows) > 1 else len(mm)
+        return mm[rows[0][0]:stop].decode('latin-1')
+
+
+def check_stations(index_path, stations_csv="igs_stations.csv"):
+    """Compare indexed receiver/antenna/radome against the IGS station list.
+
+    Returns (file, field, header value, igs value) tuples for every mismatch.
+    """
+    igs = {}
+    with open(stations_csv, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            igs.setdefault(row['Site Name'][:4].upper(), row)
+
+    mismatches = []
+    with _open_index(index_path) as conn:
+        rows = conn.execute("SELECT name, station, receiver, antenna, radome FROM files").fetchall()
+    for name, station, receiver, antenna, radome in rows:
+        site = igs.get(station)
+        if site is None:
+            continue
+        for field, value, expected in (('receiver', receiver, site['Receiver']),
+                                       ('antenna', antenna, site['Antenna']),
+                                       ('radome', radome, site['Radome'])):
+            if value.upper() != expected.strip().upper():
+                mismatches.append((name, field, value, expected))
+    return mismatches
@@ -0,0 +1,94 @@
+import re
+from datetime import timedelta
+
+# Single-letter file types of the daily RINEX 2 names the archive serves: ssssDDD0.YYt.Z
+# (Hatanaka obs; GPS, GLONASS and SBAS nav)
+NAME_TYPES = {"obs": ("d",), "nav": ("n", "g", "h")}
+# Typical compressed file size, only used for dry-run estimates when sizes are not probed
+AVG_FILE_BYTES = {"obs": 1_500_000, "nav": 60_000}
+# Typical size of one day directory index page on the archive
+AVG_LISTING_BYTES = 250_000
+# A station code that fully determines the file name
+STATION_CODE = re.compile(r'^[a-z0-9]{4}$', re.IGNORECASE)
+
+# Past this many predicted files per day a day listing is cheaper than one blind request
+# per file, because it also tells which files do not exist and avoids their 404 round-trips
+DIRECT_LIMIT = 40
+
+
+def normalize_prefixes(prefixes):
+    """Strip station prefixes; an empty list means every station, as in the form GUI."""
+    return [p.strip() for p in prefixes if p.strip()] or ['all']
+
+
+def station_codes(prefixes):
+    """Return the distinct lower-case station codes, or None unless every prefix is a full code."""
+    prefixes = normalize_prefixes(prefixes)
+    if prefixes == ['all'] or not all(STATION_CODE.match(p) for p in prefixes):
+        return None
+    return list(dict.fromkeys(p.lower() for p in prefixes))
+
+
+def predicted_names(station, file_type, day):
+    """Return the daily file names a station can have, e.g. iisc0010.24n.Z, iisc0010.24g.Z, iisc0010.24h.Z."""
+    doy = day.timetuple().tm_yday
+    return [f"{station.lower()}{doy:03d}0.{day.year % 100:02d}{t}.Z" for t in NAME_TYPES[file_type]]
+
+
+def plan_request(base_url, file_type, start_date, end_date, prefixes, direct_limit=DIRECT_LIMIT):
+    """Turn a request into one step per day, each with the cheapest strategy.
+
+    A "direct" step carries the URLs of every daily file type the archive
+    serves for the stations (see NAME_TYPES) and needs no listing; other files
+    in the directory are only found by listing. A "list" step is used for
+    'all', partial prefixes, or more predicted files than direct_limit, and
+    must fetch the day index to learn the file names. The archive only has
+    day-level indexes, so there is no year-level step.
+    """
+    codes = station_codes(prefixes)
+    direct = codes is not None and len(codes) * len(NAME_TYPES[file_type]) <= direct_limit
+
+    steps = []
+    day = start_date
+    while day <= end_date:
+        url = f"{base_url}/{day.year}/{day.timetuple().tm_yday:03d}/"
+        if direct:
+            urls = [url + name for code in codes for name in predicted_names(code, file_type, day)]
+            steps.append({'strategy': 'direct', 'day': day, 'url': url, 'urls': urls})
+        else:
+            steps.append({'strategy': 'list', 'day': day, 'url': url, 'urls': None})
+        day += timedelta(days=1)
+    return steps
+
+
+def estimate(steps, file_type, prefixes, sizes=None):
+    """Estimate request counts and bytes of a plan before executing it.
+
+    sizes maps URLs to probed Content-Length values (None for files missing
+    on the server); other files are counted at AVG_FILE_BYTES. The number of
+    files behind a 'list' step is only known for explicit station lists.
+    """
+    sizes = sizes or {}
+    avg = AVG_FILE_BYTES[file_type]
+    codes = station_codes(prefixes)
+    known_per_day = None if codes is None else len(codes) * len(NAME_TYPES[file_type])
+
+    result = {'days': len(steps), 'direct_days': 0, 'list_days': 0,
+              'listing_requests': 0, 'file_requests': 0, 'bytes': 0, 'complete': True}
+    for step in steps:
+        if step['strategy'] == 'direct':
+            result['direct_days'] += 1
+            result['file_requests'] += len(step['urls'])
+            for url in step['urls']:
+                size = sizes.get(url, avg)
+                result['bytes'] += size or 0
+        else:
+            result['list_days'] += 1
+            result['listing_requests'] += 1
+            result['bytes'] += AVG_LISTING_BYTES
+            if known_per_day is None:
+                result['complete'] = False
+            else:
+                result['file_requests'] += known_per_day
+                result['bytes'] += known_per_day * avg
+    return result
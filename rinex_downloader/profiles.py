@@ -0,0 +1,71 @@
+"""Configuration profiles reproducing the behaviour of each front-end script.
+
+gui          "dialog" (simple prompts) or "form" (date pickers and progress bar)
+file_types   file types the front-end offers; the first one is the default
+layout       "flat" writes files into the download directory by name,
+             "mirror" keeps the archive's type/year/doy directories
+threads      concurrent downloads per process
+retries      HTTP retries on 5xx responses (0 disables the retry adapter)
+progress     show a tqdm progress bar per file
+"""
+
+PROFILES = {
+    "v1": {
+        "gui": "dialog",
+        "file_types": ["obs", "nav"],
+        "layout": "flat",
+        "threads": 1,
+        "retries": 0,
+        "progress": False,
+    },
+    "obs": {
+        "gui": "dialog",
+        "file_types": ["obs"],
+        "layout": "flat",
+        "threads": 1,
+        "retries": 0,
+        "progress": False,
+    },
+    "nav": {
+        "gui": "dialog",
+        "file_types": ["nav"],
+        "layout": "flat",
+        "threads": 1,
+        "retries": 0,
+        "progress": False,
+    },
+    "v2": {
+        "gui": "form",
+        "file_types": ["obs", "nav"],
+        "layout": "mirror",
+        "threads": 3,
+        "retries": 0,
+        "progress": False,
+    },
+    "v3": {
+        "gui": "form",
+        "file_types": ["obs", "nav"],
+        "layout": "mirror",
+        "threads": 3,
+        "retries": 0,
+        "progress": True,
+    },
+    "v3.01": {
+        "gui": "form",
+        "file_types": ["obs", "nav"],
+        "layout": "mirror",
+        "threads": 3,
+        "retries": 3,
+        "progress": True,
+    },
+}
+
+DEFAULT_PROFILE = "v3.01"
+
+
+def get_profile(name=None):
+    """Return a copy of a profile, so callers can adjust it without touching the defaults."""
+    name = name or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile '{name}', choose from {', '.join(PROFILES)}")
+    return dict(PROFILES[name])
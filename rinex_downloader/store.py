@@ -0,0 +1,183 @@
+import errno
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+# ioctl request for a copy-on-write clone (Linux, btrfs/XFS)
+FICLONE = 0x40049409
+
+
+class LocalStore:
+    """Content-addressed file store shared by several download directories.
+
+    Objects live under objects/<sha256[:2]>/<sha256> and an SQLite index maps
+    each archive URL to its object together with the size and ETag it was
+    fetched with. Archive files do not change once published, so by default a
+    URL hit is served without any network I/O. With revalidate, callers pass
+    the size and ETag from a HEAD request to lookup(), and a hit whose stored
+    values differ is dropped and fetched again. Output trees get hardlinks (or reflinks,
+    or copies as a last resort) so a file is stored once however many teams
+    request it. When the store grows beyond max_bytes the least recently used
+    objects are evicted; hardlinked copies in output trees stay intact.
+    """
+
+    def __init__(self, root, max_bytes=None, timeout=60, revalidate=False):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.revalidate = revalidate
+        self.timeout = timeout
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        (self.root / "tmp").mkdir(exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS objects (
+                    sha256 TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    sha256 TEXT NOT NULL REFERENCES objects (sha256),
+                    size INTEGER NOT NULL,
+                    etag TEXT
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS objects_lru ON objects (last_access)")
+
+    @contextmanager
+    def _transaction(self):
+        conn = sqlite3.connect(self.root / "index.sqlite", timeout=self.timeout)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _object_path(self, sha256):
+        return self.root / "objects" / sha256[:2] / sha256
+
+    def temp_path(self, name):
+        """Return a unique temporary path on the store's filesystem, so add() can rename it."""
+        return self.root / "tmp" / f"{uuid.uuid4().hex}-{name}"
+
+    def lookup(self, url, size=None, etag=None):
+        """Return the object path cached for url, or None, and mark it as recently used.
+
+        When size or etag are given (the server's current values) an entry
+        stored with different values is treated as stale and forgotten.
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT sha256, size, etag FROM urls WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            if (size is not None and size != row[1]) or (etag and row[2] and etag != row[2]):
+                logging.info(f"Stale store entry for {url}")
+                conn.execute("DELETE FROM urls WHERE url = ?", (url,))
+                return None
+            path = self._object_path(row[0])
+            if not path.exists():
+                # Removed behind our back; forget it so it is downloaded again
+                conn.execute("DELETE FROM urls WHERE sha256 = ?", (row[0],))
+                conn.execute("DELETE FROM objects WHERE sha256 = ?", (row[0],))
+                return None
+            conn.execute("UPDATE objects SET last_access = ? WHERE sha256 = ?", (time.time(), row[0]))
+        return path
+
+    def add(self, url, tmp_path, etag=None, dest=None):
+        """Move a freshly downloaded file into the store and return its object path.
+
+        When dest is given the file is linked there before it enters the
+        store, so an eviction by another process cannot take it away first.
+        """
+        digest = hashlib.sha256()
+        with open(tmp_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+        size = os.path.getsize(tmp_path)
+        if dest is not None:
+            self.link(tmp_path, dest)
+
+        path = self._object_path(sha256)
+        path.parent.mkdir(exist_ok=True)
+        if path.exists():
+            # Same content already stored under another URL
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO objects (sha256, size, last_access) VALUES (?, ?, ?) "
+                "ON CONFLICT (sha256) DO UPDATE SET last_access = excluded.last_access",
+                (sha256, size, time.time()),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO urls (url, sha256, size, etag) VALUES (?, ?, ?, ?)",
+                (url, sha256, size, etag),
+            )
+        # Callers linking the returned path themselves need the new object to survive
+        self.evict(keep=sha256)
+        return path
+
+    def link(self, src, dest):
+        """Materialise a store object at dest as a hardlink, reflink or copy."""
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + '.part')
+        if tmp.exists():
+            tmp.unlink()
+        try:
+            os.link(src, tmp)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+            self._clone_or_copy(src, tmp)
+        os.replace(tmp, dest)
+
+    @staticmethod
+    def _clone_or_copy(src, dest):
+        with open(src, 'rb') as fsrc, open(dest, 'wb') as fdst:
+            try:
+                # fcntl does not exist on Windows, where the file is simply copied
+                import fcntl
+
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return
+            except (ImportError, OSError):
+                pass
+            shutil.copyfileobj(fsrc, fdst, 1 << 20)
+
+    def evict(self, keep=None):
+        """Delete least recently used objects until the store fits in max_bytes.
+
+        The object named by keep is never evicted, so a file larger than the
+        cap can still be linked out once before later evictions remove it.
+        """
+        if not self.max_bytes:
+            return 0
+        freed = 0
+        with self._transaction() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            for sha256, size in conn.execute("SELECT sha256, size FROM objects ORDER BY last_access").fetchall():
+                if total - freed <= self.max_bytes:
+                    break
+                if sha256 == keep:
+                    continue
+                try:
+                    os.remove(self._object_path(sha256))
+                except FileNotFoundError:
+                    pass
+                conn.execute("DELETE FROM urls WHERE sha256 = ?", (sha256,))
+                conn.execute("DELETE FROM objects WHERE sha256 = ?", (sha256,))
+                freed += size
+        logging.info(f"Evicted {freed / 1e6:.1f} MB from {self.root}")
+        return freed
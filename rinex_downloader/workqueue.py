@@ -0,0 +1,214 @@
+import logging
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+
+
+def station_of(file_url):
+    """Return the four-character station code of a RINEX file URL."""
+    return file_url.rsplit('/', 1)[-1][:4].lower()
+
+
+def day_of(file_url):
+    """Return the (year, doy) directory pair of a RINEX file URL."""
+    year, doy = file_url.split('/')[-3:-1]
+    return int(year), int(doy)
+
+
+def assign_shards(file_links, n_shards, shard_by="station"):
+    """Partition file URLs into n_shards and return (url, shard) pairs.
+
+    "station" hashes the station code, so all days of one station land in the
+    same shard. "day" splits the sorted list of days into contiguous ranges.
+    """
+    if shard_by == "station":
+        # crc32 rather than hash() so every process and node agrees on the shard
+        return [(url, zlib.crc32(station_of(url).encode()) % n_shards) for url in file_links]
+    if shard_by == "day":
+        days = sorted({day_of(url) for url in file_links})
+        per_shard = max(1, -(-len(days) // n_shards))
+        day_shard = {day: i // per_shard for i, day in enumerate(days)}
+        return [(url, day_shard[day_of(url)]) for url in file_links]
+    raise ValueError(f"Unknown shard mode: {shard_by}")
+
+
+class WorkQueue:
+    """SQLite work queue shared by downloader processes, locally or across nodes.
+
+    Every file is a row keyed by its URL, so planning the same request twice
+    (for example once per node) never queues a file twice, and claiming a row
+    is a single write transaction, so no file is handed to two workers.
+    The default rollback journal is kept because WAL does not work on network
+    filesystems.
+    """
+
+    def __init__(self, path, timeout=60, max_attempts=3, retry_delay=30):
+        self.path = str(path)
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        # Seconds before the first retry of a failed file, doubled on every further attempt
+        self.retry_delay = retry_delay
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    url TEXT PRIMARY KEY,
+                    shard INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    bytes INTEGER NOT NULL DEFAULT 0,
+                    started REAL,
+                    finished REAL,
+                    not_before REAL NOT NULL DEFAULT 0
+                )""")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(files)")]
+            if 'not_before' not in columns:
+                # Queues created before retries were delayed
+                conn.execute("ALTER TABLE files ADD COLUMN not_before REAL NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS files_status ON files (status, shard)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=self.timeout)
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, items, exists=None):
+        """Queue (url, shard) pairs and return how many of them need fetching.
+
+        URLs new to the queue are inserted. Known URLs that previously failed or
+        were missing on the server are queued again with fresh attempts, and so
+        are finished ones when exists(url) reports their local file is gone.
+        Known rows take the shard of this call, except running ones, which are
+        left to whoever holds them.
+        """
+        items = list(items)
+        with self._transaction() as conn:
+            queued = conn.executemany("INSERT OR IGNORE INTO files (url, shard) VALUES (?, ?)", items).rowcount
+            conn.executemany("UPDATE files SET shard = ? WHERE url = ? AND status != 'running'",
+                             [(shard, url) for url, shard in items])
+            urls = [(url,) for url, _ in items]
+            queued += conn.executemany(
+                "UPDATE files SET status = 'pending', attempts = 0, not_before = 0 "
+                "WHERE url = ? AND status IN ('failed', 'missing')", urls
+            ).rowcount
+            if exists is not None:
+                done = [row[0] for row in conn.execute("SELECT url FROM files WHERE status = 'done'")]
+                wanted = {url for url, in urls}
+                gone = [(url,) for url in done if url in wanted and not exists(url)]
+                queued += conn.executemany(
+                    "UPDATE files SET status = 'pending', attempts = 0, bytes = 0, not_before = 0 WHERE url = ?", gone
+                ).rowcount
+            return queued
+
+    def claim(self, worker, shard=None):
+        """Atomically take the next pending URL, preferring the given shard.
+
+        Falls back to any other shard once the preferred one is drained, so
+        uneven shards do not leave workers idle. Files waiting for a retry are
+        skipped until their delay has passed. Returns None when nothing is
+        ready; has_pending() tells whether to wait or stop.
+        """
+        conn = self._connect()
+        try:
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = None
+            if shard is not None:
+                row = conn.execute(
+                    "SELECT url FROM files WHERE status = 'pending' AND not_before <= ? AND shard = ? LIMIT 1",
+                    (now, shard),
+                ).fetchone()
+            if row is None:
+                row = conn.execute(
+                    "SELECT url FROM files WHERE status = 'pending' AND not_before <= ? LIMIT 1", (now,)
+                ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE files SET status = 'running', worker = ?, started = ?, attempts = attempts + 1 WHERE url = ?",
+                (worker, now, row[0]),
+            )
+            conn.execute("COMMIT")
+            return row[0]
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def finish(self, url, ok, nbytes=0):
+        """Record the outcome of a claimed URL; failures are re-queued until max_attempts.
+
+        ok=None marks a file the server does not have, which is never retried.
+        """
+        with self._transaction() as conn:
+            if ok is None:
+                conn.execute("UPDATE files SET status = 'missing', finished = ? WHERE url = ?", (time.time(), url))
+            elif ok:
+                conn.execute(
+                    "UPDATE files SET status = 'done', bytes = ?, finished = ? WHERE url = ?",
+                    (nbytes, time.time(), url),
+                )
+            else:
+                now = time.time()
+                conn.execute(
+                    "UPDATE files SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                    "finished = ?, not_before = ? * (1 << (attempts - 1)) + ? WHERE url = ?",
+                    (self.max_attempts, now, self.retry_delay, now, url),
+                )
+
+    def has_pending(self):
+        """True while files are still queued, including ones waiting for a retry."""
+        with self._transaction() as conn:
+            return conn.execute("SELECT 1 FROM files WHERE status = 'pending' LIMIT 1").fetchone() is not None
+
+    def requeue_stale(self, older_than=3600):
+        """Return rows left 'running' by crashed workers to the pending state."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE files SET status = 'pending' WHERE status = 'running' AND started < ?",
+                (time.time() - older_than,),
+            )
+            if cur.rowcount:
+                logging.warning(f"Re-queued {cur.rowcount} stale files")
+            return cur.rowcount
+
+    def report(self, urls=None, since=None):
+        """Return per-shard statistics merged from every worker that touched the queue.
+
+        urls limits the report to the files of one batch, so rows left by
+        earlier runs on a persistent queue are not counted. Bytes, workers and
+        the started/finished times only cover files claimed at or after since.
+        """
+        with self._transaction() as conn:
+            source = "files"
+            if urls is not None:
+                conn.execute("CREATE TEMP TABLE batch (url TEXT PRIMARY KEY)")
+                conn.executemany("INSERT OR IGNORE INTO batch VALUES (?)", ((url,) for url in urls))
+                source = "files JOIN batch USING (url)"
+            recent = "started >= :since" if since is not None else "1"
+            rows = conn.execute(f"""
+                SELECT shard,
+                       COUNT(*),
+                       SUM(status = 'done'),
+                       SUM(status = 'failed'),
+                       SUM(status = 'missing'),
+                       SUM(status IN ('pending', 'running')),
+                       COALESCE(SUM(CASE WHEN {recent} THEN bytes END), 0),
+                       COUNT(DISTINCT CASE WHEN {recent} THEN worker END),
+                       MIN(CASE WHEN {recent} THEN started END),
+                       MAX(CASE WHEN {recent} THEN finished END)
+                FROM {source} GROUP BY shard ORDER BY shard""", {"since": since}).fetchall()
+        keys = ("shard", "files", "done", "failed", "missing", "remaining", "bytes", "workers", "started", "finished")
+        return [dict(zip(keys, row)) for row in rows]
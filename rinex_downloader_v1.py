@@ -0,0 +1,4 @@
+from rinex_downloader.cli import main
+
+if __name__ == "__main__":
+    main("v1")
@@ -0,0 +1,21 @@
+import pytest
+
+from rinex_downloader.cli import parse_args
+
+
+def test_type_follows_profile_option():
+    # The front-end's profile only supplies the default for --profile
+    args = parse_args("v3.01", ["--profile", "nav", "--start", "2024-01-01"])
+    assert (args.profile, args.type) == ("nav", "nav")
+    args = parse_args("nav", ["--profile", "v3.01", "--type", "obs"])
+    assert (args.profile, args.type) == ("v3.01", "obs")
+
+
+def test_type_defaults_to_front_end_profile():
+    assert parse_args("nav", []).type == "nav"
+    assert parse_args("v3.01", []).type == "obs"
+
+
+def test_type_must_exist_in_selected_profile():
+    with pytest.raises(SystemExit):
+        parse_args("v3.01", ["--profile", "obs", "--type", "nav"])
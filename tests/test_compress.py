@@ -0,0 +1,50 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from rinex_downloader.compress import expand_rinex, expanded_name, is_hatanaka, read_rinex, unlzw
+
+DATA = Path(__file__).parent / "data"
+
+
+@pytest.mark.parametrize("name", ["epochs.10bit.Z", "epochs.16bit.Z"])
+def test_unlzw(name):
+    # The 10-bit stream fills its table several times, so it also exercises clear codes
+    expected = (DATA / "epochs.txt").read_bytes()
+    assert unlzw((DATA / name).read_bytes()) == expected
+
+
+def test_unlzw_rejects_other_data():
+    with pytest.raises(ValueError):
+        unlzw(gzip.compress(b"not a compress stream"))
+    with pytest.raises(ValueError):
+        unlzw((DATA / "epochs.16bit.Z").read_bytes()[:3] + b"\xff" * 8)
+
+
+def test_read_rinex_python_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr("rinex_downloader.compress.shutil.which", lambda name: None)
+    path = tmp_path / "epochs.txt.Z"
+    path.write_bytes((DATA / "epochs.16bit.Z").read_bytes())
+    assert read_rinex(path) == (DATA / "epochs.txt").read_bytes()
+
+
+@pytest.mark.parametrize("name, expanded, hatanaka", [
+    ("iisc0010.24d.Z", "iisc0010.24o", True),
+    ("iisc0010.24o.gz", "iisc0010.24o", False),
+    ("IISC00IND_R_20240010000_01D_30S_MO.crx.gz", "IISC00IND_R_20240010000_01D_30S_MO.rnx", True),
+    ("iisc0010.24n", "iisc0010.24n", False),
+])
+def test_expanded_name(name, expanded, hatanaka):
+    assert expanded_name(name) == expanded
+    assert is_hatanaka(name) == hatanaka
+
+
+def test_expand_rinex_into_cache_dir(tmp_path):
+    plain = (DATA / "iisc0010.24o").read_bytes()
+    path = tmp_path / "iisc0010.24o.gz"
+    path.write_bytes(gzip.compress(plain))
+    out = expand_rinex(path, tmp_path / "expanded")
+    assert out == tmp_path / "expanded" / "iisc0010.24o"
+    assert out.read_bytes() == plain
+    assert expand_rinex(out) == out
@@ -0,0 +1,132 @@
+from datetime import datetime
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from rinex_downloader.core import RinexDownloader  # noqa: E402
+from rinex_downloader.planner import AVG_FILE_BYTES  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None, text=""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code), response=self)
+
+
+class FakeSession:
+    """Stands in for requests.Session: answers from a url -> response (or exception) table."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def _answer(self, url, headers=None):
+        self.calls.append((url, dict(headers or {})))
+        answer = self.responses.get(url, FakeResponse(404))
+        if callable(answer):
+            answer = answer(headers or {})
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    def head(self, url, **kwargs):
+        return self._answer(url, kwargs.get("headers"))
+
+    def get(self, url, **kwargs):
+        return self._answer(url, kwargs.get("headers"))
+
+
+def test_probe_failures_count_at_average_size():
+    downloader = RinexDownloader("v3.01")
+    base = downloader.base_urls["obs"] + "/2024/001/"
+    downloader.session = FakeSession({
+        base + "iisc0010.24d.Z": FakeResponse(200, {"content-length": "1000"}),
+        base + "hyde0010.24d.Z": requests.RequestException("timed out"),
+    })
+    day = datetime(2024, 1, 1)
+    result = downloader.dry_run("obs", day, day, ["iisc", "hyde", "jdpr"], probe=True)
+    # jdpr answers 404 and costs nothing; hyde could not be probed and keeps the average
+    assert result["file_requests"] == 3
+    assert result["bytes"] == 1000 + AVG_FILE_BYTES["obs"]
+
+
+class StopWatch(Exception):
+    pass
+
+
+def listing(*names):
+    return "".join(f'<a href="{name}">{name}</a>\n' for name in names)
+
+
+def test_watch_polls(monkeypatch, tmp_path):
+    downloader = RinexDownloader("v3.01")
+    downloader.download_dir = str(tmp_path)
+    base = downloader.base_urls["obs"]
+    day1, day2, day3 = (f"{base}/2024/{doy:03d}/" for doy in (1, 2, 3))
+
+    def unchanged(etag, links):
+        # 304 only when the client sends back the ETag it was given
+        return lambda headers: (FakeResponse(304) if headers.get("If-None-Match") == etag
+                                else FakeResponse(200, {"ETag": etag}, listing(*links)))
+
+    session = FakeSession({day1: unchanged('"a"', ["iisc0010.24d.Z", "hyde0010.24d.Z"])})
+    downloader.session = session
+    # Parse anchors without BeautifulSoup, which the loop itself does not depend on
+    monkeypatch.setattr(downloader, "_parse_listing",
+                        lambda url, html, prefixes: [url + line.split('"')[1] for line in html.splitlines()])
+
+    attempts = []
+    failing = {day1 + "hyde0010.24d.Z"}
+
+    def download_file(url):
+        attempts.append(url)
+        if url in failing:
+            failing.discard(url)
+            return False
+        return True
+
+    monkeypatch.setattr(downloader, "download_file", download_file)
+
+    clock = [datetime(2024, 1, 2, 0, 10)]
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock[0].replace(tzinfo=tz)
+
+    monkeypatch.setattr("rinex_downloader.core.datetime", FakeDatetime)
+
+    polls = []
+
+    def next_poll(seconds):
+        polls.append(list(attempts))
+        attempts.clear()
+        if len(polls) == 1:
+            # Today's directory appears on the server
+            session.responses[day2] = unchanged('"b"', ["jdpr0020.24d.Z"])
+        elif len(polls) == 2:
+            clock[0] = datetime(2024, 1, 3, 0, 10)
+        else:
+            raise StopWatch
+
+    monkeypatch.setattr("rinex_downloader.core.time.sleep", next_poll)
+    with pytest.raises(StopWatch):
+        downloader.watch("obs", ["all"], interval=0, jitter=0, max_workers=1)
+
+    # Day 2 does not exist yet on the first poll (404); the failed hyde file is retried
+    assert polls[0] == [day1 + "iisc0010.24d.Z", day1 + "hyde0010.24d.Z"]
+    assert polls[1] == [day1 + "hyde0010.24d.Z", day2 + "jdpr0020.24d.Z"]
+    # After the rollover day 2 is answered with 304 from the cached links and nothing is fetched again
+    assert polls[2] == []
+    assert session.calls[-2] == (day2, {"If-None-Match": '"b"'})
+    assert session.calls[-1] == (day3, {})
+    # The second poll of day 1 was conditional too
+    assert (day1, {"If-None-Match": '"a"'}) in session.calls
+    # Day 1 has rolled out of the window and its cached listing is gone
+    assert {key[0] for key in downloader._listings} == {day2}
@@ -0,0 +1,68 @@
+import csv
+import shutil
+from pathlib import Path
+
+from rinex_downloader.navmerge import merge_nav_day, merge_nav_files, parse_nav
+
+DATA = Path(__file__).parent / "data"
+GPS_304 = DATA / "IISC00IND_R_20240010000_01D_GN.rnx"
+GLONASS_304 = DATA / "HYDE00IND_R_20240010000_01D_RN.rnx"
+MIXED_305 = DATA / "LCK300IND_R_20240010000_01D_MN.rnx"
+
+
+def test_parse_nav_v2():
+    header, version, records = parse_nav((DATA / "iisc0010.24n").read_bytes())
+    assert version == 2.11
+    assert header[-1].endswith("END OF HEADER")
+    assert [key for key, _ in records] == [("G01", "2024 01 01 00 00 00", 0.0), ("G02", "2024 01 01 02 00 00", 7200.0)]
+    assert all(len(lines) == 8 for _, lines in records)
+
+
+def test_parse_nav_v304_glonass():
+    _, version, records = parse_nav(GLONASS_304.read_bytes())
+    assert version == 3.04
+    assert [key for key, _ in records] == [("R01", "2024 01 01 00 00 00", None), ("R02", "2024 01 01 00 00 00", None)]
+    assert all(len(lines) == 4 for _, lines in records)
+
+
+def test_parse_nav_v305_glonass():
+    # GLONASS records have five lines from 3.05 on; the records after them must still line up
+    _, version, records = parse_nav(MIXED_305.read_bytes())
+    assert version == 3.05
+    assert [(key[0], len(lines)) for key, lines in records] == [("R02", 5), ("G01", 8), ("E05", 8)]
+    assert records[2][0] == ("E05", "2024 01 01 01 00 00", 3600.0)
+
+
+def test_merge_nav_files(tmp_path):
+    out = tmp_path / "brdm0010.24p"
+    assert merge_nav_files([GPS_304, GLONASS_304, MIXED_305], out) == 5
+
+    header, version, records = parse_nav(out.read_bytes())
+    assert version == 3.05
+    assert header[0][40:60].strip() == "M: MIXED"
+    labels = [line[60:].strip() for line in header]
+    assert labels.count("IONOSPHERIC CORR") == 1
+    assert labels.count("TIME SYSTEM CORR") == 1
+    assert "MERGED FROM 3 FILES" in header[-2]
+    # Sorted by time then satellite, duplicates dropped, 3.04 GLONASS records padded to five lines
+    assert [key[0] for key, _ in records] == ["G01", "R01", "R02", "E05", "G02"]
+    assert [len(lines) for _, lines in records] == [8, 5, 5, 8, 8]
+
+    with open(tmp_path / "brdm0010.24p.idx", newline="") as f:
+        rows = list(csv.DictReader(f))
+    data = out.read_bytes()
+    for row, (key, lines) in zip(rows, records):
+        offset, length = int(row["offset"]), int(row["length"])
+        assert data[offset:offset + length].decode() == "\n".join(lines) + "\n"
+
+
+def test_merge_nav_day_selects_files_by_date(tmp_path):
+    for path in (GPS_304, GLONASS_304, DATA / "iisc0010.24n"):
+        shutil.copy(path, tmp_path)
+    # A file of another day in the same (flat) directory must not be merged
+    shutil.copy(DATA / "iisc0010.24n", tmp_path / "iisc0020.24n")
+
+    written = merge_nav_day(tmp_path, 2024, 1)
+    assert sorted(path.name for path in written) == ["brdc0010.24n", "brdm0010.24p"]
+    assert "MERGED FROM 1 FILES" in (tmp_path / "brdc0010.24n").read_text()
+    assert "MERGED FROM 2 FILES" in (tmp_path / "brdm0010.24p").read_text()
@@ -0,0 +1,71 @@
+import calendar
+import gzip
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+from rinex_downloader.obsindex import EXPANDED_DIR, files_covering, index_obs_file, read_epoch, scan_obs
+
+DATA = Path(__file__).parent / "data"
+OBS_V2 = DATA / "iisc0010.24o"
+OBS_V3 = DATA / "IISC00IND_R_20240010000_01D_30S_MO.rnx"
+MIDNIGHT = calendar.timegm((2024, 1, 1, 0, 0, 0))
+
+
+def test_scan_obs_v2():
+    info = scan_obs(OBS_V2)
+    assert info["marker"] == "IISC"
+    assert info["receiver"] == "SEPT POLARX5"
+    assert (info["antenna"], info["radome"]) == ("SEPCHOKE_B3E6", "SPKE")
+    assert info["interval"] == 30.0
+    # The event flag 4 record at 00:00:15 is a comment block, not an epoch
+    assert [epoch - MIDNIGHT for epoch, _ in info["epochs"]] == [0, 30, 60]
+    data = OBS_V2.read_bytes()
+    assert [data[offset:offset + 15] for _, offset in info["epochs"]] == [
+        b" 24  1  1  0  0", b" 24  1  1  0  0", b" 24  1  1  0  1"]
+
+
+def test_scan_obs_v3():
+    info = scan_obs(OBS_V3)
+    assert info["version"] == 3.04
+    assert [epoch - MIDNIGHT for epoch, _ in info["epochs"]] == [0, 30]
+    data = OBS_V3.read_bytes()
+    assert all(data[offset:offset + 7] == b"> 2024 " for _, offset in info["epochs"])
+
+
+def test_index_and_read_epoch(tmp_path):
+    path = tmp_path / "iisc0010.24o.gz"
+    path.write_bytes(gzip.compress(OBS_V2.read_bytes()))
+    index_path = index_obs_file(path)
+    assert (tmp_path / EXPANDED_DIR / "iisc0010.24o").exists()
+
+    files = files_covering(index_path, datetime(2024, 1, 1, 0, 0, 45), datetime(2024, 1, 1, 2))
+    assert [(row["name"], row["source"], row["n_epochs"]) for row in files] == [
+        ("iisc0010.24o", "iisc0010.24o.gz", 3)]
+    assert files_covering(index_path, datetime(2024, 1, 2), datetime(2024, 1, 3)) == []
+
+    # Clearing the expanded/ cache only costs a re-expansion
+    shutil.rmtree(tmp_path / EXPANDED_DIR)
+    assert read_epoch(index_path, "iisc0010.24o", datetime(2024, 1, 1, 0, 0, 10)) == (
+        " 24  1  1  0  0 30.0000000  0  1G01\n  20000100.123\n")
+    assert read_epoch(index_path, "iisc0010.24o", datetime(2024, 1, 1, 0, 1)) == (
+        " 24  1  1  0  1  0.0000000  0  1G02\n  21000200.456\n")
+    assert read_epoch(index_path, "iisc0010.24o", datetime(2024, 1, 1, 0, 2)) is None
+
+
+def test_index_plain_file_in_place(tmp_path):
+    path = Path(shutil.copy(OBS_V3, tmp_path))
+    index_path = index_obs_file(path)
+    assert not (tmp_path / EXPANDED_DIR).exists()
+    assert read_epoch(index_path, path.name, datetime(2024, 1, 1)).startswith("> 2024 01 01 00 00  0.0000000")
+
+
+def test_flat_directory_shares_one_index(tmp_path):
+    # Flat profiles write every day into the download directory
+    day1 = tmp_path / "iisc0010.24o.gz"
+    day1.write_bytes(gzip.compress(OBS_V2.read_bytes()))
+    day2 = tmp_path / "iisc0020.24o.gz"
+    day2.write_bytes(gzip.compress(OBS_V2.read_bytes().replace(b" 24  1  1 ", b" 24  1  2 ")))
+    assert index_obs_file(day1) == index_obs_file(day2) == tmp_path / "obs_index.sqlite"
+    files = files_covering(tmp_path / "obs_index.sqlite", datetime(2024, 1, 2), datetime(2024, 1, 2, 1))
+    assert [row["name"] for row in files] == ["iisc0020.24o"]
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from rinex_downloader.planner import (AVG_FILE_BYTES, AVG_LISTING_BYTES, DIRECT_LIMIT, estimate,
+                                      normalize_prefixes, plan_request, station_codes)
+
+BASE = "https://example.org/pub/rinex"
+DAY = datetime(2024, 1, 1)
+
+
+def test_empty_prefixes_mean_all():
+    assert normalize_prefixes([]) == ["all"]
+    assert normalize_prefixes("".split(",")) == ["all"]
+    assert normalize_prefixes(" , ,".split(",")) == ["all"]
+    assert normalize_prefixes([" iisc", "HYDE "]) == ["iisc", "HYDE"]
+
+
+def test_station_codes_are_deduplicated():
+    assert station_codes(["IISC", "iisc", "hyde", "Hyde"]) == ["iisc", "hyde"]
+    assert station_codes(["all"]) is None
+    assert station_codes(["iis"]) is None
+
+
+def test_station_list_is_planned_directly():
+    steps = plan_request(BASE, "obs", DAY, datetime(2024, 1, 2), ["IISC", "iisc", "hyde"])
+    assert [step["strategy"] for step in steps] == ["direct", "direct"]
+    assert steps[0]["urls"] == [f"{BASE}/2024/001/iisc0010.24d.Z", f"{BASE}/2024/001/hyde0010.24d.Z"]
+    assert steps[1]["urls"][0] == f"{BASE}/2024/002/iisc0020.24d.Z"
+
+
+def test_nav_predicts_every_daily_type():
+    # GLONASS and SBAS files are needed for the merged brdc .g/.h products
+    [step] = plan_request(BASE, "nav", DAY, DAY, ["iisc"])
+    assert step["urls"] == [f"{BASE}/2024/001/iisc0010.24{t}.Z" for t in "ngh"]
+
+
+def test_listing_for_all_partial_and_long_lists():
+    for prefixes in (["all"], [], ["iis"], ["iisc", "hy"]):
+        [step] = plan_request(BASE, "obs", DAY, DAY, prefixes)
+        assert (step["strategy"], step["url"], step["urls"]) == ("list", f"{BASE}/2024/001/", None)
+    many = [f"s{i:03d}" for i in range(DIRECT_LIMIT + 1)]
+    assert plan_request(BASE, "obs", DAY, DAY, many)[0]["strategy"] == "list"
+    # Three nav types per station reach the limit sooner
+    nav = many[:DIRECT_LIMIT // 3 + 1]
+    assert plan_request(BASE, "obs", DAY, DAY, nav)[0]["strategy"] == "direct"
+    assert plan_request(BASE, "nav", DAY, DAY, nav)[0]["strategy"] == "list"
+
+
+def test_estimate_direct_with_probed_sizes():
+    steps = plan_request(BASE, "obs", DAY, datetime(2024, 1, 2), ["iisc", "hyde"])
+    sizes = {steps[0]["urls"][0]: 1000, steps[0]["urls"][1]: None}
+    result = estimate(steps, "obs", ["iisc", "hyde"], sizes)
+    assert result == {"days": 2, "direct_days": 2, "list_days": 0, "listing_requests": 0,
+                      "file_requests": 4, "bytes": 1000 + 2 * AVG_FILE_BYTES["obs"], "complete": True}
+
+
+def test_estimate_listed_days():
+    many = [f"s{i:03d}" for i in range(DIRECT_LIMIT + 1)] * 2
+    steps = plan_request(BASE, "obs", DAY, DAY, many)
+    result = estimate(steps, "obs", many)
+    assert (result["list_days"], result["listing_requests"], result["file_requests"]) == (1, 1, DIRECT_LIMIT + 1)
+    assert result["bytes"] == AVG_LISTING_BYTES + (DIRECT_LIMIT + 1) * AVG_FILE_BYTES["obs"]
+    assert result["complete"]
+
+    result = estimate(plan_request(BASE, "nav", DAY, DAY, ["all"]), "nav", ["all"])
+    assert (result["file_requests"], result["bytes"], result["complete"]) == (0, AVG_LISTING_BYTES, False)
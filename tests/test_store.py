@@ -0,0 +1,80 @@
+import itertools
+
+import pytest
+
+from rinex_downloader import store as store_module
+from rinex_downloader.store import LocalStore
+
+URL = "https://example.org/pub/rinex/2024/001/{}0010.24d.Z"
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    # A strictly increasing clock keeps the LRU order deterministic
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(store_module.time, "time", lambda: next(ticks))
+
+
+def add(store, station, content, **kwargs):
+    tmp = store.temp_path(station)
+    tmp.write_bytes(content)
+    return store.add(URL.format(station), tmp, **kwargs)
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = LocalStore(tmp_path / "store")
+    assert add(store, "iisc", b"same") == add(store, "hyde", b"same")
+    assert store.lookup(URL.format("iisc")) == store.lookup(URL.format("hyde"))
+    assert len(list((tmp_path / "store" / "objects").rglob("*"))) == 2  # one prefix directory, one object
+    assert not any((tmp_path / "store" / "tmp").iterdir())
+
+
+def test_evicts_least_recently_used(tmp_path):
+    store = LocalStore(tmp_path / "store", max_bytes=20)
+    add(store, "iisc", b"a" * 8)
+    add(store, "hyde", b"b" * 8)
+    store.lookup(URL.format("iisc"))
+    add(store, "jdpr", b"c" * 8)
+    assert store.lookup(URL.format("hyde")) is None
+    assert store.lookup(URL.format("iisc")) is not None
+    assert store.lookup(URL.format("jdpr")) is not None
+
+
+def test_oversize_object_survives_its_own_add(tmp_path):
+    store = LocalStore(tmp_path / "store", max_bytes=10)
+    add(store, "iisc", b"a" * 8)
+    path = add(store, "hyde", b"b" * 32)
+    assert path.exists()
+    assert store.lookup(URL.format("iisc")) is None
+    # The next add is free to evict it
+    add(store, "jdpr", b"c" * 4)
+    assert store.lookup(URL.format("hyde")) is None
+
+
+def test_add_links_dest_before_eviction(tmp_path):
+    store = LocalStore(tmp_path / "store", max_bytes=10)
+    dest = tmp_path / "out" / "iisc0010.24d.Z"
+    add(store, "iisc", b"a" * 32, dest=dest)
+    # Another process evicting the object must not take the output file with it
+    LocalStore(tmp_path / "store", max_bytes=1).evict()
+    assert store.lookup(URL.format("iisc")) is None
+    assert dest.read_bytes() == b"a" * 32
+
+
+def test_lookup_drops_stale_entries(tmp_path):
+    store = LocalStore(tmp_path / "store")
+    add(store, "iisc", b"a" * 8, etag='"v1"')
+    assert store.lookup(URL.format("iisc"), 8, '"v1"') is not None
+    # Unknown server values do not invalidate the entry
+    assert store.lookup(URL.format("iisc"), None, None) is not None
+    assert store.lookup(URL.format("iisc"), 9, '"v1"') is None
+    assert store.lookup(URL.format("iisc")) is None
+
+    add(store, "hyde", b"b" * 8, etag='"v1"')
+    assert store.lookup(URL.format("hyde"), 8, '"v2"') is None
+
+
+def test_lookup_forgets_deleted_objects(tmp_path):
+    store = LocalStore(tmp_path / "store")
+    add(store, "iisc", b"a" * 8).unlink()
+    assert store.lookup(URL.format("iisc")) is None
@@ -0,0 +1,100 @@
+import time
+from multiprocessing import Pool
+
+from rinex_downloader.workqueue import WorkQueue, assign_shards
+
+URLS = [f"https://example.org/pub/rinex/2024/{doy:03d}/{station}{doy:03d}0.24d.Z"
+        for doy in (1, 2, 3) for station in ("iisc", "hyde", "jdpr", "pbr4")]
+
+
+def _claim_all(args):
+    queue_path, worker = args
+    queue = WorkQueue(queue_path)
+    claimed = []
+    while (url := queue.claim(worker)) is not None:
+        claimed.append(url)
+        queue.finish(url, True, 1)
+    return claimed
+
+
+def test_assign_shards():
+    by_station = dict(assign_shards(URLS, 3, "station"))
+    assert len({by_station[url] for url in URLS if "/iisc" in url}) == 1
+    by_day = dict(assign_shards(URLS, 3, "day"))
+    assert [by_day[url] for url in URLS[::4]] == [0, 1, 2]
+
+
+def test_claim_hands_out_each_url_once(tmp_path):
+    queue_path = str(tmp_path / "queue.sqlite")
+    assert WorkQueue(queue_path).add(assign_shards(URLS, 4)) == len(URLS)
+    with Pool(4) as pool:
+        claimed = pool.map(_claim_all, [(queue_path, f"w{i}") for i in range(4)])
+    urls = [url for worker_urls in claimed for url in worker_urls]
+    assert sorted(urls) == sorted(URLS)
+    assert sum(row["done"] for row in WorkQueue(queue_path).report()) == len(URLS)
+
+
+def test_claim_prefers_shard(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.add([(URLS[0], 0), (URLS[1], 1)])
+    assert queue.claim("w", shard=1) == URLS[1]
+    # Once its own shard is drained a worker helps with the others
+    assert queue.claim("w", shard=1) == URLS[0]
+    assert queue.claim("w", shard=1) is None
+    assert not queue.has_pending()
+
+
+def test_failed_files_wait_and_give_up(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", retry_delay=3600)
+    queue.add([(URLS[0], 0)])
+    url = queue.claim("w")
+    queue.finish(url, False)
+    assert queue.claim("w") is None
+    assert queue.has_pending()
+
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_attempts=2, retry_delay=0)
+    queue.add([(URLS[1], 0)])
+    for _ in range(2):
+        assert queue.claim("w") == URLS[1]
+        queue.finish(URLS[1], False)
+    assert queue.claim("w") is None
+    assert queue.report()[0]["failed"] == 1
+
+
+def test_add_requeues_failed_missing_and_deleted(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_attempts=1)
+    items = [(url, 0) for url in URLS[:4]]
+    queue.add(items)
+    outcomes = {URLS[0]: False, URLS[1]: None, URLS[2]: True, URLS[3]: True}
+    while (url := queue.claim("w")) is not None:
+        queue.finish(url, outcomes[url], 1)
+    assert queue.report()[0]["remaining"] == 0
+
+    # URLS[2] was deleted locally, URLS[3] is still there
+    requeued = queue.add(items, exists=lambda url: url != URLS[2])
+    assert requeued == 3
+    claimed = set()
+    while (url := queue.claim("w")) is not None:
+        claimed.add(url)
+        queue.finish(url, True, 1)
+    assert claimed == {URLS[0], URLS[1], URLS[2]}
+
+
+def test_report_covers_only_this_batch(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.add([(url, 0) for url in URLS[:3]])
+    while (url := queue.claim("old")) is not None:
+        queue.finish(url, True, 1_000_000)
+
+    since = time.time()
+    batch = URLS[2:4]
+    # A second run with more workers: the re-planned file moves to its new shard
+    queue.add([(URLS[2], 1), (URLS[3], 1)])
+    while (url := queue.claim("new")) is not None:
+        queue.finish(url, True, 500)
+
+    report = queue.report(batch, since=since)
+    assert [(row["shard"], row["files"], row["done"], row["bytes"], row["workers"]) for row in report] == [
+        (1, 2, 2, 500, 1)]
+    assert report[0]["started"] >= since
+    assert sum(row["files"] for row in queue.report()) == 4